@@ -1,111 +1,267 @@
 import streamlit as st
+import atexit
+import copy
+import threading
+import re
+import functools
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # --- Page Configuration (MUST be the first Streamlit command) ---
 st.set_page_config(layout="wide", page_title="Web Performance Analyzer")
 
-# --- Helper Functions (no changes) ---
+# --- Helper Functions ---
 
+_URL_RE = re.compile(r'^https?://[^\s/$.?#].[^\s]*$', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=1024)
 def is_valid_url(url):
-    """Checks if the provided string is a valid URL."""
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except ValueError:
-        return False
-
-def get_resource_rating_and_tip(row):
-    """Analyzes a resource and returns a rating and optimization tip."""
-    res_type, duration, size = row["Type"], row["Duration (ms)"], row["Size (KB)"]
-    rating, tip = "Good ✅", "No action needed."
-
-    if res_type in ["script", "css"]:
-        if duration > 500 or size > 150:
-            rating, tip = "Poor ❌", "Critical resource. Defer if possible, minify, and reduce size."
-        elif duration > 200 or size > 75:
-            rating, tip = "Needs Improvement ⚠️", "This resource is blocking rendering. Try to minify and optimize delivery."
-    elif res_type == "img":
-        if size > 500:
-            rating, tip = "Poor ❌", "Very large image. Compress heavily and use a modern format like WebP/AVIF."
-        elif size > 200:
-            rating, tip = "Needs Improvement ⚠️", "Large image. Compress and consider resizing to the displayed dimensions."
-    elif res_type == "font" and (duration > 700 or size > 150):
-        rating, tip = "Poor ❌", "Large font file. Use WOFF2 format and preload critical fonts."
-
-    if rating == "Good ✅" and duration > 1000:
-        rating, tip = "Needs Improvement ⚠️", "This resource took a long time to load. Investigate network latency."
-    
-    return rating, tip
-
-# --- Core Selenium Logic (no changes) ---
-
-@st.cache_data
-def get_website_speed(url, browser_name):
-    driver = None
-    try:
-        headless_options = ["--headless", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--window-size=1920,1080"]
-        if browser_name == "Chrome":
-            options = ChromeOptions()
-            for arg in headless_options: options.add_argument(arg)
-            driver = webdriver.Chrome(options=options)
-        elif browser_name == "Firefox":
-            options = FirefoxOptions()
-            options.add_argument("--headless")
-            driver = webdriver.Firefox(options=options)
-        elif browser_name == "Edge":
-            options = EdgeOptions()
-            for arg in headless_options: options.add_argument(arg)
-            driver = webdriver.Edge(options=options)
-        else:
-            raise ValueError("Unsupported browser selected.")
-
-        driver.get(url)
-        timing_info = driver.execute_script("return window.performance.timing;")
-        
-        navigation_start = timing_info.get('navigationStart', 0)
-        response_start = timing_info.get('responseStart', 0)
-        dom_complete = timing_info.get('domComplete', 0)
-        domain_lookup_start = timing_info.get('domainLookupStart', 0)
-        domain_lookup_end = timing_info.get('domainLookupEnd', 0)
-        connect_start = timing_info.get('connectStart', 0)
-        connect_end = timing_info.get('connectEnd', 0)
-
-        if dom_complete == 0: return {"Error": "Page did not finish loading."}
-
-        result = {
-            "Time to First Byte (ms)": response_start - navigation_start,
-            "Frontend Performance (ms)": dom_complete - response_start,
-            "Total Page Load Time (ms)": dom_complete - navigation_start,
-            "DNS Lookup Time (ms)": domain_lookup_end - domain_lookup_start,
-            "TCP Connection Time (ms)": connect_end - connect_start
+    """Checks if the provided string is a valid http(s) URL."""
+    return bool(_URL_RE.match(url or ""))
+
+# (kind, tier) -> (rating, tip); tier 2 is poor, 1 needs improvement, anything missing is good.
+_RATINGS = {
+    ("script", 2): ("Poor ❌", "Critical resource. Defer if possible, minify, and reduce size."),
+    ("script", 1): ("Needs Improvement ⚠️", "This resource is blocking rendering. Try to minify and optimize delivery."),
+    ("img", 2): ("Poor ❌", "Very large image. Compress heavily and use a modern format like WebP/AVIF."),
+    ("img", 1): ("Needs Improvement ⚠️", "Large image. Compress and consider resizing to the displayed dimensions."),
+    ("font", 2): ("Poor ❌", "Large font file. Use WOFF2 format and preload critical fonts."),
+    ("other", 1): ("Needs Improvement ⚠️", "This resource took a long time to load. Investigate network latency."),
+}
+_KINDS = ("script", "img", "font", "other")
+_GOOD = ("Good ✅", "No action needed.")
+_RATING_TABLE = np.array([[_RATINGS.get((kind, tier), _GOOD)[0] for tier in range(3)] for kind in _KINDS], dtype=object)
+_TIP_TABLE = np.array([[_RATINGS.get((kind, tier), _GOOD)[1] for tier in range(3)] for kind in _KINDS], dtype=object)
+
+def get_resource_ratings_and_tips(df):
+    """Rates every resource by bucketing it into a tier and indexing the constant rating table."""
+    res_type, duration, size = df["Type"].to_numpy(), df["Duration (ms)"].to_numpy(), df["Size (KB)"].to_numpy()
+    script_css, img, font = np.isin(res_type, ["script", "css"]), res_type == "img", res_type == "font"
+
+    # right=True makes each bin edge inclusive, matching the original strict ">" thresholds.
+    kinds = np.select([script_css, img, font], [0, 1, 2], default=3)
+    tiers = np.select([script_css, img, font], [
+        np.maximum(np.digitize(duration, (200, 500), right=True), np.digitize(size, (75, 150), right=True)),
+        np.digitize(size, (200, 500), right=True),
+        2 * np.maximum(np.digitize(duration, (700,), right=True), np.digitize(size, (150,), right=True)),
+    ], default=0)
+    # Anything not flagged by its type-specific rule still needs attention if it was slow.
+    slow = (tiers == 0) & (duration > 1000)
+    kinds, tiers = np.where(slow, 3, kinds), np.where(slow, 1, tiers)
+    return _RATING_TABLE[kinds, tiers], _TIP_TABLE[kinds, tiers]
+
+# --- Core Selenium Logic ---
+
+DRIVER_MAX_USES = 20  # Recycle each long-lived browser after this many analyses to keep it stable.
+PAGE_LOAD_TIMEOUT = 30  # Seconds to wait for domComplete after navigation.
+TOP_RESOURCES = 30  # Slowest resources shipped back from the browser and rated.
+_CDP_BROWSERS = ("Chrome", "Edge")  # Chromium drivers whose cache and cookies can be cleared over CDP.
+
+_HEADLESS = ("--headless", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--window-size=1920,1080")
+HTML_ONLY_PREFS = {"profile.managed_default_content_settings.images": 2}
+
+@functools.lru_cache(maxsize=None)
+def _drivers():
+    """Browser name -> (options class, driver class, arguments); selenium is only imported on the first analysis."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.edge.options import Options as EdgeOptions
+    return {
+        "Chrome": (ChromeOptions, webdriver.Chrome, _HEADLESS),
+        "Firefox": (FirefoxOptions, webdriver.Firefox, ("--headless",)),
+        "Edge": (EdgeOptions, webdriver.Edge, _HEADLESS),
+    }
+
+@functools.lru_cache(maxsize=None)
+def _options(browser_name, html_only):
+    """Options are built once per (browser, html_only); callers deep-copy them before handing them to a driver."""
+    opt_cls, _, args = _drivers()[browser_name]
+    options = opt_cls()
+    for arg in args: options.add_argument(arg)
+    options.page_load_strategy = "eager"
+    if html_only and browser_name == "Firefox":
+        options.set_preference("permissions.default.image", 2)
+    elif html_only:
+        options.add_experimental_option("prefs", HTML_ONLY_PREFS)
+    return options
+
+def _build_driver(browser_name, html_only=False):
+    drivers = _drivers()
+    if browser_name not in drivers:
+        raise ValueError("Unsupported browser selected.")
+    driver = drivers[browser_name][1](options=copy.deepcopy(_options(browser_name, html_only)), keep_alive=True)
+    return _warm_up(driver)
+
+def _warm_up(driver):
+    """Pays the browser's first-navigation and JS engine start-up cost before any measured run."""
+    driver.get("about:blank")
+    driver.execute_script("performance.getEntriesByType('navigation'); performance.getEntriesByType('resource');")
+    return driver
+
+def _quit_drivers(drivers):
+    for driver in drivers.values():
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    drivers.clear()
+
+@st.cache_resource(show_spinner=False)
+def _driver_pool():
+    """Process-wide pool of long-lived drivers, shared across reruns and sessions."""
+    pool = {"drivers": {}, "uses": {}, "locks": {}, "origins": {}}
+    atexit.register(_quit_drivers, pool["drivers"])
+    return pool
+
+def _close_drivers():
+    """Quits every pooled browser; fresh ones are started by the next analysis."""
+    pool = _driver_pool()
+    for key in list(pool["drivers"]):
+        with pool["locks"].setdefault(key, threading.Lock()):
+            _retire_driver(pool, key)
+
+def _retire_driver(pool, key):
+    """Quits the pooled driver for key and forgets its history."""
+    pool["uses"][key] = 0
+    pool["origins"].pop(key, None)
+    driver = pool["drivers"].pop(key, None)
+    if driver:
+        _quit_drivers({key: driver})
+
+def _release_driver(pool, key, recycle=False):
+    """Counts a use and quits the driver when asked to or once it reaches DRIVER_MAX_USES."""
+    uses = pool["uses"][key] = pool["uses"].get(key, 0) + 1
+    if recycle or uses >= DRIVER_MAX_USES:
+        _retire_driver(pool, key)
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def _reusable(pool, key, url):
+    """Whether the pooled driver for key can measure url as if it were a freshly launched browser."""
+    last_origin = pool["origins"].get(key)
+    # DNS entries and sockets survive a reset, so never reuse a driver on its last origin.
+    return last_origin is None or (key[0] in _CDP_BROWSERS and last_origin != _origin(url))
+
+def _reset_browser_state(driver):
+    """Clears the HTTP cache and all cookies so cached responses don't skew the timings or sizes."""
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+def _measure_page(driver, url):
+    from selenium.webdriver.support.ui import WebDriverWait
+    driver.execute_script("window.performance.clearResourceTimings();")
+    driver.get(url)
+    # Eager loading returns at DOMContentLoaded, so poll until domComplete.
+    timings = WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(lambda d: d.execute_script("""
+        const nav = performance.getEntriesByType('navigation')[0];
+        if (!nav || !(nav.domComplete > 0)) return null;
+        const entries = performance.getEntriesByType('resource');
+        const byType = {};
+        for (const e of entries) {
+            const type = e.initiatorType || 'unknown';
+            byType[type] = (byType[type] || 0) + e.duration;
         }
+        const top = entries.sort((a, b) => b.duration - a.duration).slice(0, arguments[0]);
+        return {
+            nav: {
+                ttfb: nav.responseStart,
+                frontend: nav.domComplete - nav.responseStart,
+                total: nav.domComplete,
+                dns: nav.domainLookupEnd - nav.domainLookupStart,
+                tcp: nav.connectEnd - nav.connectStart
+            },
+            count: entries.length,
+            byType: byType,
+            top: {
+                names: top.map(e => e.name.substring(e.name.lastIndexOf('/') + 1).split('?')[0]),
+                types: top.map(e => e.initiatorType || 'unknown'),
+                durations: top.map(e => e.duration),
+                sizes: top.map(e => e.transferSize || 0)
+            }
+        };
+    """, TOP_RESOURCES))
+    nav, top = timings['nav'], timings['top']
+
+    result = {
+        "Time to First Byte (ms)": round(nav['ttfb']),
+        "Frontend Performance (ms)": round(nav['frontend']),
+        "Total Page Load Time (ms)": round(nav['total']),
+        "DNS Lookup Time (ms)": round(nav['dns']),
+        "TCP Connection Time (ms)": round(nav['tcp'])
+    }
+
+    result["Resource Count"] = timings['count']
+    result["Type Summary"] = pd.Series(timings['byType'], dtype="float64")
+
+    slowest = pd.DataFrame({
+        "Name": top['names'],
+        "Type": pd.Categorical(top['types']),
+        "Duration (ms)": np.asarray(top['durations'], dtype=np.float32),
+        "Size (KB)": np.asarray(top['sizes'], dtype=np.float32) / 1024
+    })
+    ratings, tips = get_resource_ratings_and_tips(slowest)
+    result["Slowest Resources"] = slowest.assign(**{"Rating": ratings, "Optimization Tip": tips})
+
+    return result
 
-        resource_timings = driver.execute_script("""
-            return window.performance.getEntriesByType('resource').map(entry => ({
-                name: entry.name, initiatorType: entry.initiatorType,
-                duration: entry.duration, transferSize: entry.transferSize }));
-        """)
-        
-        result["Resource Data"] = [{
-            "Name": resource.get('name', '').split('/')[-1].split('?')[0],
-            "Type": resource.get('initiatorType', 'unknown'),
-            "Duration (ms)": resource.get('duration', 0),
-            "Size (KB)": resource.get('transferSize', 0) / 1024
-        } for resource in resource_timings]
-
-        return result
+# Failures raise, so only successful measurements are cached.
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def get_website_speed(url, browser_name, reuse=False, html_only=False):
+    from selenium.common.exceptions import TimeoutException
+    if not reuse:
+        driver = _build_driver(browser_name, html_only)
+        try:
+            return _measure_page(driver, url)
+        finally:
+            _quit_drivers({browser_name: driver})
+    pool = _driver_pool()
+    key = (browser_name, html_only)
+    with pool["locks"].setdefault(key, threading.Lock()):
+        failed = False
+        try:
+            if key in pool["drivers"] and not _reusable(pool, key, url):
+                _retire_driver(pool, key)
+            driver = pool["drivers"].get(key)
+            if driver is None:
+                driver = pool["drivers"][key] = _build_driver(browser_name, html_only)
+            if browser_name in _CDP_BROWSERS:
+                _reset_browser_state(driver)
+            pool["origins"][key] = _origin(url)
+            return _measure_page(driver, url)
+        except TimeoutException:
+            # Slow page, healthy driver: keep it.
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _release_driver(pool, key, recycle=failed)
+
+def _speed_or_error(url, browser_name, reuse=False, html_only=False):
+    """Runs get_website_speed and turns a failure into an error result without caching it."""
+    from selenium.common.exceptions import TimeoutException
+    try:
+        return get_website_speed(url, browser_name, reuse, html_only)
+    except TimeoutException:
+        return {"Error": "Page did not finish loading."}
     except Exception as e:
         return {"Error": f"An unexpected error occurred: {str(e)}"}
-    finally:
-        if driver:
-            driver.quit()
+
+_DEFAULTS = {
+    "Time to First Byte (ms)": 0,
+    "Total Page Load Time (ms)": 0,
+    "DNS Lookup Time (ms)": 0,
+    "TCP Connection Time (ms)": 0,
+    "Frontend Performance (ms)": 0,
+}
 
 # --- NEW: Login Logic ---
 # The st.login function will return True if the user is authenticated, and False otherwise.
@@ -120,6 +276,14 @@ if st.login(st.secrets["credentials"]):
     url = st.text_input("Enter the URL to evaluate:", "https://streamlit.io")
     available_browsers = ["Chrome", "Firefox", "Edge"]
     selected_browsers = st.multiselect("Select browsers:", options=available_browsers, default=available_browsers)
+    reuse_sessions = st.checkbox("Reuse browser sessions", value=False, help="Keep Chrome and Edge open between analyses of different sites. Their cache and cookies are cleared before every run, but DNS lookups and connections to shared hosts (e.g. CDNs) can stay warm, so repeat runs may read faster than a first visit. Off launches a clean browser every time.")
+    if st.button("Close drivers", help="Quit all open browsers now; new ones start with the next analysis."):
+        _close_drivers()
+        st.success("All browsers closed.")
+    force_refresh = st.checkbox("Force refresh (ignore results cached in the last 5 minutes)")
+    html_only = st.checkbox("Skip images (measure HTML/JS/CSS only)")
+    if html_only:
+        st.caption("Images are not downloaded, so load times reflect non-media load only and will read lower than a real visit.")
 
     if st.button("Analyze Website Performance"):
         if not is_valid_url(url):
@@ -127,60 +291,62 @@ if st.login(st.secrets["credentials"]):
         elif not selected_browsers:
             st.warning("Please select at least one browser.")
         else:
-            all_results_data = []
+            if force_refresh:
+                get_website_speed.clear()
+            results = {}
+            placeholders = {browser: st.empty() for browser in selected_browsers}
 
-            for browser in selected_browsers:
-                st.markdown("---")
-                st.header(f"Analysis for: {browser}")
-                result = get_website_speed(url, browser)
-                if "Error" in result:
-                    st.error(f"Could not complete analysis: {result['Error']}")
-                    continue
-
-                result['browser'] = browser
-                all_results_data.append(result)
+            with st.spinner(f"Testing {len(selected_browsers)} browsers in parallel..."):
+                with ThreadPoolExecutor(max_workers=len(selected_browsers), initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as executor:
+                    futures = {executor.submit(_speed_or_error, url, browser, reuse_sessions, html_only): browser for browser in selected_browsers}
+                    for future in as_completed(futures):
+                        browser, result = futures[future], future.result()
+                        with placeholders[browser].container():
+                            st.markdown("---")
+                            st.header(f"Analysis for: {browser}")
+                            if "Error" in result:
+                                st.error(f"Could not complete analysis: {result['Error']}")
+                                continue
+
+                            result = results[browser] = {**_DEFAULTS, **result, "browser": browser}
                 
-                st.subheader("Core Metrics")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("Time to First Byte (TTFB)", f"{result.get('Time to First Byte (ms)', 0)} ms")
-                    with st.popover("ℹ️", use_container_width=True): st.markdown("**Excellent:** < 500 ms, **Good:** 501-800 ms, **Needs Improvement:** 801-1800 ms, **Poor:** > 1800 ms")
-                with col2:
-                    st.metric("Total Page Load Time", f"{result.get('Total Page Load Time (ms)', 0)} ms")
-                    with st.popover("ℹ️", use_container_width=True): st.markdown("**Excellent:** < 2000 ms, **Good:** 2001-2500 ms, **Needs Improvement:** 2501-4000 ms, **Poor:** > 4000 ms")
-
-                st.subheader("Performance Breakdown")
-                col1, col2, col3 = st.columns(3)
-                col1.metric("DNS Lookup", f"{result.get('DNS Lookup Time (ms)', 0)} ms")
-                col2.metric("TCP Connection", f"{result.get('TCP Connection Time (ms)', 0)} ms")
-                col3.metric("Frontend Processing", f"{result.get('Frontend Performance (ms)', 0)} ms")
+                            st.subheader("Core Metrics")
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                st.metric("Time to First Byte (TTFB)", f"{result['Time to First Byte (ms)']} ms")
+                                with st.popover("ℹ️", use_container_width=True): st.markdown("**Excellent:** < 500 ms, **Good:** 501-800 ms, **Needs Improvement:** 801-1800 ms, **Poor:** > 1800 ms")
+                            with col2:
+                                st.metric("Total Page Load Time", f"{result['Total Page Load Time (ms)']} ms")
+                                with st.popover("ℹ️", use_container_width=True): st.markdown("**Excellent:** < 2000 ms, **Good:** 2001-2500 ms, **Needs Improvement:** 2501-4000 ms, **Poor:** > 4000 ms")
+
+                            st.subheader("Performance Breakdown")
+                            col1, col2, col3 = st.columns(3)
+                            col1.metric("DNS Lookup", f"{result['DNS Lookup Time (ms)']} ms")
+                            col2.metric("TCP Connection", f"{result['TCP Connection Time (ms)']} ms")
+                            col3.metric("Frontend Processing", f"{result['Frontend Performance (ms)']} ms")
                 
-                st.subheader("Resource Analysis")
-                df = pd.DataFrame(result["Resource Data"])
-                if not df.empty:
-                    with st.expander("📊 View Resource Load Contribution by Type"):
-                        type_summary = df.groupby("Type")["Duration (ms)"].sum()
-                        fig = go.Figure(data=[go.Pie(labels=type_summary.index, values=type_summary.values, hole=.4, hovertemplate="%{label}: <br>%{value:.0f} ms (%{percent})")])
-                        fig.update_layout(showlegend=True, title_text='Contribution to Load Time by Resource Type')
-                        st.plotly_chart(fig, use_container_width=True)
-
-                    with st.expander("📜 View Top 30 Slowest Resources with Optimization Tips", expanded=True):
-                        slowest_resources = df.sort_values(by="Duration (ms)", ascending=False).head(30)
-                        ratings_tips = slowest_resources.apply(get_resource_rating_and_tip, axis=1, result_type='expand')
-                        slowest_resources[['Rating', 'Optimization Tip']] = ratings_tips
-                        st.dataframe(slowest_resources[["Name", "Type", "Duration (ms)", "Size (KB)", "Rating", "Optimization Tip"]],
-                                    width='stretch', hide_index=True,
-                                    column_config={"Duration (ms)": st.column_config.NumberColumn(format="%d ms"), "Size (KB)": st.column_config.NumberColumn(format="%.1f KB")})
+                            st.subheader("Resource Analysis")
+                            if result["Resource Count"]:
+                                with st.expander("📊 View Resource Load Contribution by Type"):
+                                    type_summary = result["Type Summary"]
+                                    fig = go.Figure(data=[go.Pie(labels=type_summary.index, values=type_summary.values, hole=.4, hovertemplate="%{label}: <br>%{value:.0f} ms (%{percent})")])
+                                    fig.update_layout(showlegend=True, title_text='Contribution to Load Time by Resource Type')
+                                    st.plotly_chart(fig, use_container_width=True)
+
+                                with st.expander(f"📜 View Top {TOP_RESOURCES} Slowest Resources with Optimization Tips", expanded=True):
+                                    st.dataframe(result["Slowest Resources"][["Name", "Type", "Duration (ms)", "Size (KB)", "Rating", "Optimization Tip"]],
+                                                width='stretch', hide_index=True,
+                                                column_config={"Duration (ms)": st.column_config.NumberColumn(format="%d ms"), "Size (KB)": st.column_config.NumberColumn(format="%.1f KB")})
+
+            all_results_data = [results[browser] for browser in selected_browsers if browser in results]
 
             if len(all_results_data) > 1:
                 st.markdown("---")
                 st.header("📊 Final Browser Performance Comparison")
-                comparison_df = pd.DataFrame([{
-                    "Browser": res["browser"],
-                    "Total Page Load Time (ms)": res.get("Total Page Load Time (ms)", 0),
-                    "Time to First Byte (ms)": res.get("Time to First Byte (ms)", 0),
-                    "Frontend Performance (ms)": res.get("Frontend Performance (ms)", 0)
-                } for res in all_results_data]).set_index("Browser")
+                comparison_metrics = ("Total Page Load Time (ms)", "Time to First Byte (ms)", "Frontend Performance (ms)")
+                comparison_df = pd.DataFrame(
+                    np.array([[res[metric] for metric in comparison_metrics] for res in all_results_data], dtype=np.int32),
+                    index=pd.Index([res["browser"] for res in all_results_data], name="Browser"), columns=comparison_metrics)
                 st.markdown("This table compares key metrics across browsers. **Green is faster (better)**, Red is slower (worse).")
                 styled_df = comparison_df.style.background_gradient(cmap='RdYlGn_r', axis=0)
                 st.dataframe(styled_df, width='stretch')
@@ -195,21 +361,19 @@ if st.login(st.secrets["credentials"]):
                     for res in all_results_data:
                         report_string += f"## Analysis for {res['browser']}\n"
                         report_string += "**Core Metrics:**\n"
-                        report_string += f"- Time to First Byte (TTFB): {res.get('Time to First Byte (ms)', 0)} ms\n"
-                        report_string += f"- Total Page Load Time: {res.get('Total Page Load Time (ms)', 0)} ms\n"
-                        report_string += f"- DNS Lookup: {res.get('DNS Lookup Time (ms)', 0)} ms\n"
-                        report_string += f"- TCP Connection: {res.get('TCP Connection Time (ms)', 0)} ms\n"
-                        report_string += f"- Frontend Processing: {res.get('Frontend Performance (ms)', 0)} ms\n\n"
+                        report_string += f"- Time to First Byte (TTFB): {res['Time to First Byte (ms)']} ms\n"
+                        report_string += f"- Total Page Load Time: {res['Total Page Load Time (ms)']} ms\n"
+                        report_string += f"- DNS Lookup: {res['DNS Lookup Time (ms)']} ms\n"
+                        report_string += f"- TCP Connection: {res['TCP Connection Time (ms)']} ms\n"
+                        report_string += f"- Frontend Processing: {res['Frontend Performance (ms)']} ms\n\n"
                         
                         report_string += "**Resource Analysis:**\n"
-                        df = pd.DataFrame(res["Resource Data"])
-                        if not df.empty:
-                            report_string += f"- Total Resources Loaded: {len(df)}\n"
-                            slowest_resources = df.sort_values(by="Duration (ms)", ascending=False).head(10)
+                        slowest_resources = res["Slowest Resources"]
+                        if not slowest_resources.empty:
+                            report_string += f"- Total Resources Loaded: {res['Resource Count']}\n"
                             report_string += "- **Top 10 Slowest Resources (Potential Bottlenecks):**\n"
-                            for i, (_, row) in enumerate(slowest_resources.iterrows(), 1):
-                                _, tip = get_resource_rating_and_tip(row)
-                                report_string += f"  {i}. **{row['Name']}** ({row['Type']}) - **Load Time:** {row['Duration (ms)']:.0f} ms, **Size:** {row['Size (KB)']:.1f} KB. **Suggestion:** {tip}\n"
+                            for i, (_, row) in enumerate(slowest_resources.head(10).iterrows(), 1):
+                                report_string += f"  {i}. **{row['Name']}** ({row['Type']}) - **Load Time:** {row['Duration (ms)']:.0f} ms, **Size:** {row['Size (KB)']:.1f} KB. **Suggestion:** {row['Optimization Tip']}\n"
                         report_string += "\n"
                     
                     st.text_area("Copy this report to feed to a language model for improvement advice:", report_string, height=400)
@@ -1,106 +1,413 @@
 import streamlit as st
+import atexit
+import copy
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 import pandas as pd
+import numpy as np
+import os
 import platform
+import re
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# --- Browser Sessions ---
+DRIVER_MAX_USES = 20  # Recycle each long-lived browser after this many analyses to keep it stable.
+PAGE_LOAD_TIMEOUT = 30
+TOP_RESOURCES = 20  # Slowest resources shipped back from the browser and shown per page.
+_CDP_BROWSERS = ("Chrome", "Edge")  # Chromium drivers whose cache and cookies can be cleared over CDP.
+HTML_ONLY_PREFS = {"profile.managed_default_content_settings.images": 2}
+# Last path segment of a resource URL, without its query string or fragment.
+_TAIL_RE = re.compile(r'([^/?#]+)(?:[?#]|$)')
+
+def _chromium_options(options_class, html_only):
+    options = options_class()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--log-level=3")
+    options.page_load_strategy = "eager"
+    if html_only:
+        options.add_experimental_option("prefs", HTML_ONLY_PREFS)
+    return options
+
+def _firefox_options(html_only):
+    options = FirefoxOptions()
+    options.add_argument("--headless")
+    options.page_load_strategy = "eager"
+    if html_only:
+        options.set_preference("permissions.default.image", 2)
+    return options
+
+# Deep-copied per driver, since the driver writes to its options.
+_OPTIONS = {}
+for _html_only in (False, True):
+    _OPTIONS["Chrome", _html_only] = _chromium_options(ChromeOptions, _html_only)
+    _OPTIONS["Firefox", _html_only] = _firefox_options(_html_only)
+    _OPTIONS["Edge", _html_only] = _chromium_options(EdgeOptions, _html_only)
+
+_FACTORIES = {
+    "Chrome": lambda html_only: webdriver.Chrome(options=copy.deepcopy(_OPTIONS["Chrome", html_only]), service=ChromeService(log_output=os.devnull), keep_alive=True),
+    "Firefox": lambda html_only: webdriver.Firefox(options=copy.deepcopy(_OPTIONS["Firefox", html_only]), keep_alive=True),
+    "Edge": lambda html_only: webdriver.Edge(options=copy.deepcopy(_OPTIONS["Edge", html_only]), service=EdgeService(log_output=os.devnull), keep_alive=True),
+    "Safari": lambda html_only: webdriver.Safari(keep_alive=True),
+}
+
+def _build_driver(browser_name, html_only=False):
+    return _warm_up(_FACTORIES[browser_name](html_only))
+
+def _warm_up(driver):
+    """Pays the browser's first-navigation and JS engine start-up cost before any measured run."""
+    driver.get("about:blank")
+    driver.execute_script("performance.getEntriesByType('navigation'); performance.getEntriesByType('resource');")
+    return driver
+
+def _try_build_driver(browser_name):
+    try:
+        return _build_driver(browser_name)
+    except Exception:
+        return None
+
+def _safari_available():
+    return shutil.which("safaridriver") is not None and platform.system() == "Darwin"
+
+@st.cache_resource(show_spinner=False)
+def _driver_registry():
+    """Process-wide drivers keyed by (browser, html_only), one lock each; shared across reruns and sessions."""
+    registry = {"drivers": {}, "uses": {}, "locks": {}, "origins": {}, "prewarmed": set()}
+    atexit.register(_quit_drivers, registry["drivers"])
+    return registry
+
+def _prewarm_driver(registry, key):
+    with registry["locks"].setdefault(key, threading.Lock()):
+        if key not in registry["drivers"]:
+            driver = _try_build_driver(key[0])
+            if driver:
+                registry["drivers"][key] = driver
+
+def _prewarm_drivers(browsers):
+    """Launches each browser once per process on a daemon thread, so the page never waits on it."""
+    registry = _driver_registry()
+    for browser in browsers:
+        key = (browser, False)
+        if key not in registry["prewarmed"]:
+            registry["prewarmed"].add(key)
+            threading.Thread(target=_prewarm_driver, args=(registry, key), daemon=True).start()
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def _quit_drivers(drivers):
+    for driver in drivers.values():
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    drivers.clear()
+
+def _retire_driver(registry, key):
+    """Quits the registered driver for key and forgets its history."""
+    registry["uses"][key] = 0
+    registry["origins"].pop(key, None)
+    driver = registry["drivers"].pop(key, None)
+    if driver:
+        _quit_drivers({key: driver})
+
+def _release_driver(registry, key, recycle=False):
+    """Counts a use and quits the driver when asked to or once it reaches DRIVER_MAX_USES."""
+    uses = registry["uses"][key] = registry["uses"].get(key, 0) + 1
+    if recycle or uses >= DRIVER_MAX_USES:
+        _retire_driver(registry, key)
+
+def _reusable(registry, key, url):
+    """Whether the registered driver for key can measure url as if it were a freshly launched browser."""
+    last_origin = registry["origins"].get(key)
+    return last_origin is None or (key[0] in _CDP_BROWSERS and last_origin != _origin(url))
+
+def _reset_browser_state(driver):
+    """Clears the HTTP cache and all cookies so cached responses don't skew the timings."""
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+def _get_driver(registry, key, url):
+    if key in registry["drivers"] and not _reusable(registry, key, url):
+        _retire_driver(registry, key)
+    driver = registry["drivers"].get(key)
+    if driver is None or driver.session_id is None:
+        driver = registry["drivers"][key] = _build_driver(*key)
+    if key[0] in _CDP_BROWSERS:
+        _reset_browser_state(driver)
+    registry["origins"][key] = _origin(url)
+    return driver
+
+def _close_drivers():
+    """Quits every registered browser; an analysis starts only the ones it needs, when it needs them."""
+    registry = _driver_registry()
+    for key in list(registry["drivers"]):
+        with registry["locks"].setdefault(key, threading.Lock()):
+            _retire_driver(registry, key)
 
 # --- Website Speed Analyzer ---
-def get_website_speed(url, browser_name):
-    driver = None
+def _measure_page(driver, url):
+    driver.execute_script("window.performance && performance.clearResourceTimings && performance.clearResourceTimings();")
+    driver.get(url)
+    # --- Navigation and Resource Timings ---
+    timings = WebDriverWait(driver, PAGE_LOAD_TIMEOUT).until(lambda d: d.execute_script(
+        "const nav = performance.getEntriesByType('navigation')[0]; "
+        "if (!nav || !(nav.domComplete > 0)) return null; "
+        "const entries = performance.getEntriesByType('resource'); "
+        "const byType = {}; "
+        "for (const r of entries) { const t = r.initiatorType || 'unknown'; byType[t] = (byType[t] || 0) + r.duration; } "
+        "const top = entries.sort((a, b) => b.duration - a.duration).slice(0, arguments[0]); "
+        "return {nav: {backend: nav.responseStart - nav.startTime, frontend: nav.domComplete - nav.responseStart, "
+        "total: nav.domComplete - nav.startTime}, count: entries.length, byType: byType, top: {urls: top.map(r => r.name), "
+        "types: top.map(r => r.initiatorType || 'unknown'), durations: top.map(r => r.duration)}};",
+        TOP_RESOURCES
+    ))
+    nav_timing, top = timings['nav'], timings['top']
+
+    backend_performance = nav_timing['backend']
+    frontend_performance = nav_timing['frontend']
+    total_load_time = nav_timing['total']
+
+    urls = pd.Series(top['urls'], dtype=object)
+    slowest_resources = pd.DataFrame({
+        "Name": urls.str.extract(_TAIL_RE, expand=False).fillna(urls),
+        "Type": pd.Categorical(top['types']),
+        "Duration (ms)": np.asarray(top['durations'], dtype=np.float32)
+    })
+
+    return {
+        "Backend Performance (ms)": backend_performance,
+        "Frontend Performance (ms)": frontend_performance,
+        "Total Page Load Time (ms)": total_load_time,
+        "Resource Count": timings['count'],
+        "Slowest Resources": slowest_resources,
+        "Type Summary": pd.Series(timings['byType'], dtype="float64").sort_values(ascending=False)
+    }
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def get_website_speed(url, browser_name, reuse=False, html_only=False):
+    if not reuse:
+        driver = _build_driver(browser_name, html_only)
+        try:
+            return _measure_page(driver, url)
+        finally:
+            _quit_drivers({browser_name: driver})
+
+    registry = _driver_registry()
+    key = (browser_name, html_only)
+    with registry["locks"].setdefault(key, threading.Lock()):
+        failed = False
+        try:
+            return _measure_page(_get_driver(registry, key, url), url)
+        except TimeoutException:
+            # Keep the driver; only the page was slow.
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _release_driver(registry, key, recycle=failed)
+
+def _speed_or_error(url, browser_name, reuse=False, html_only=False):
+    """Runs get_website_speed and turns a failure into an error result without caching it."""
+    if browser_name not in _FACTORIES:
+        return {"Error": "Unsupported browser selected."}
     try:
-        # --- Browser Setup ---
-        if browser_name == "Chrome":
-            options = ChromeOptions()
-            options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            driver = webdriver.Chrome(options=options)
-        elif browser_name == "Firefox":
-            options = FirefoxOptions()
-            options.add_argument("--headless")
-            driver = webdriver.Firefox(options=options)
-        elif browser_name == "Edge":
-            options = EdgeOptions()
-            options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            driver = webdriver.Edge(options=options)
-        elif browser_name == "Safari":
-            if platform.system() != "Darwin":
-                return {"Error": "Safari testing is only supported on macOS with SafariDriver enabled."}
-            driver = webdriver.Safari()
-        else:
-            return {"Error": "Unsupported browser selected."}
-
-        driver.get(url)
-
-        # --- Modern Navigation Timing API ---
-        nav_timing = driver.execute_script("return performance.getEntriesByType('navigation')[0];")
-
-        if not nav_timing:
-            return {"Error": "Navigation timing data is unavailable."}
-
-        backend_performance = nav_timing.get('responseStart', 0) - nav_timing.get('startTime', 0)
-        frontend_performance = nav_timing.get('domComplete', 0) - nav_timing.get('responseStart', 0)
-        total_load_time = nav_timing.get('duration', 0)
-
-        # --- Resource Timings ---
-        resource_timings = driver.execute_script("return window.performance.getEntriesByType('resource');")
-
-        resource_data = []
-        for resource in resource_timings:
-            name = resource.get('name', '')
-            display_name = name.split('/')[-1] if "/" in name else name
-            resource_data.append({
-                "Name": display_name or name,
-                "URL": name,
-                "Type": resource.get('initiatorType', 'unknown'),
-                "Duration (ms)": resource.get('duration', 0)
-            })
-
-        return {
-            "Backend Performance (ms)": backend_performance,
-            "Frontend Performance (ms)": frontend_performance,
-            "Total Page Load Time (ms)": total_load_time,
-            "Resource Data": resource_data
-        }
+        return get_website_speed(url, browser_name, reuse, html_only)
+    except TimeoutException:
+        return {"Error": "Page did not finish loading."}
     except Exception as e:
         return {"Error": f"An unexpected error occurred: {str(e)}"}
-    finally:
-        if driver:
-            driver.quit()
+
+def _test_pages(pages, browser_name, reuse=False, html_only=False):
+    """Measures the pages one after another on a single browser, keyed by page."""
+    return {page: _speed_or_error(page, browser_name, reuse, html_only) for page in pages}
+
+# --- URL Validation ---
+_URL_RE = re.compile(r'^https?://[^\s/$.?#].[^\s]*$', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=1024)
+def is_valid_url(url):
+    """Checks if the provided string is a valid http(s) URL."""
+    return bool(_URL_RE.match(url or ""))
 
 # --- Collect internal links (limit 10) ---
+@st.cache_resource(show_spinner=False)
+def _http_session():
+    """Shared requests session so link scrapes reuse pooled keep-alive connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_data(ttl=600, show_spinner=False)
 def collect_internal_links(base_url, max_links=10):
-    try:
-        resp = requests.get(base_url, timeout=5)
-        if resp.status_code != 200:
-            return []
+    resp = _http_session().get(base_url, timeout=5)
+    resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        parsed_base = urlparse(base_url)
-        domain = f"{parsed_base.scheme}://{parsed_base.netloc}"
+    soup = BeautifulSoup(resp.text, 'lxml', parse_only=SoupStrainer('a', href=True))
+    parsed_base = urlparse(base_url)
+    domain = f"{parsed_base.scheme}://{parsed_base.netloc}"
+    base_netloc = parsed_base.netloc
 
-        links = set()
-        for a_tag in soup.find_all('a', href=True):
+    links = set()
+    for a_tag in soup.find_all('a', href=True):
+        try:
             href = urljoin(domain, a_tag['href'])
-            parsed_href = urlparse(href)
-            if parsed_href.netloc == parsed_base.netloc:
-                links.add(href)
-            if len(links) >= max_links:
-                break
+            netloc = urlparse(href).netloc
+        except ValueError:
+            continue
+        if netloc == base_netloc:
+            links.add(href)
+        if len(links) >= max_links:
+            break
+
+    return list(links)
+
+# --- Result Rendering ---
+_TOTAL_NOTE = "Total runs from navigation start to domComplete, not to the end of the load event, so it can read lower than tools that wait for onload."
+
+def _render_page(page, browser_results):
+    """Renders one page's per-browser results and returns its summary rows."""
+    st.markdown("---")
+    st.header(f"Page: {page}")
+    page_results = []
+
+    for browser, result in browser_results:
+        st.subheader(f"Browser: {browser}")
+        if "Error" in result:
+            st.error(f"Could not complete analysis on {browser}: {result['Error']}")
+            continue
+
+        page_results.append({
+            "Page": page,
+            "Browser": browser,
+            "Backend (ms)": result.get('Backend Performance (ms)', 0),
+            "Frontend (ms)": result.get('Frontend Performance (ms)', 0),
+            "Total to domComplete (ms)": result.get('Total Page Load Time (ms)', 0)
+        })
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Backend Performance", f"{result.get('Backend Performance (ms)', 0)} ms")
+        col2.metric("Frontend Performance", f"{result.get('Frontend Performance (ms)', 0)} ms")
+        col3.metric("Total Load Time (to domComplete)", f"{result.get('Total Page Load Time (ms)', 0)} ms", help=_TOTAL_NOTE)
+
+        if result["Resource Count"]:
+            st.subheader("Resource Load Time by Type")
+            st.bar_chart(result["Type Summary"])
+
+            st.subheader(f"Top {TOP_RESOURCES} Slowest Resources")
+            st.dataframe(result["Slowest Resources"][["Name", "Type", "Duration (ms)"]], width="stretch", hide_index=True,
+                         column_config={"Duration (ms)": st.column_config.NumberColumn(format="%.2f ms")})
+
+    return page_results
+
+def _render_summary(all_results):
+    if not all_results:
+        return
+
+    comp_df = pd.DataFrame(all_results)
+    comp_df['Assessment'] = comp_df['Total to domComplete (ms)'].apply(lambda x: 'Excellent' if x<1000 else ('Acceptable' if x<=3000 else 'Slow'))
+
+    st.markdown("---")
+    st.header("Overall Summary")
+    st.caption(_TOTAL_NOTE)
+
+    st.subheader("Average Metrics per Browser")
+    ms_columns = {column: st.column_config.NumberColumn(format="%.2f ms") for column in ('Backend (ms)', 'Frontend (ms)', 'Total to domComplete (ms)')}
+    avg_df = comp_df.groupby('Browser')[['Backend (ms)','Frontend (ms)','Total to domComplete (ms)']].mean().reset_index()
+    st.dataframe(avg_df, width="stretch", hide_index=True, column_config=ms_columns)
+
+    st.subheader("Full Per-Page Results")
+    st.dataframe(comp_df, width="stretch", hide_index=True, column_config=ms_columns)
+
+    # CSV Download
+    csv = comp_df.to_csv(index=False).encode('utf-8')
+    st.download_button(label="Download all results as CSV", data=csv, file_name="website_performance.csv", mime="text/csv")
+
+# --- Analysis Section ---
+# Fragment reruns redraw the stored analysis instead of relaunching Selenium.
+@st.fragment
+def analysis_section(url, test_scope, browser_choice, force_refresh, html_only, reuse_sessions):
+    if st.button("Analyze Website Performance"):
+        if not is_valid_url(url):
+            st.warning("Please enter a valid URL to begin the analysis.")
+            return
+
+        if force_refresh:
+            get_website_speed.clear()
+            collect_internal_links.clear()
 
-        return list(links)
-    except Exception:
-        return []
+        # Determine pages to test
+        if test_scope == "Test only this page":
+            pages_to_test = [url]
+        else:
+            try:
+                internal_links = collect_internal_links(url, max_links=10)
+            except (requests.RequestException, ValueError) as e:
+                st.warning(f"Could not collect internal links, testing only this page: {e}")
+                internal_links = []
+            pages_to_test = [url] + internal_links
+            st.markdown(f"Found {len(pages_to_test)} pages to test.")
+
+        if browser_choice == "All Browsers":
+            browsers_to_test = ["Chrome", "Firefox", "Edge"]
+            if st.session_state.safari_ok:
+                browsers_to_test.append("Safari")
+        else:
+            browsers_to_test = [browser_choice]
+        if "Safari" in browsers_to_test and not st.session_state.safari_ok:
+            st.error("Safari testing is only supported on macOS with SafariDriver enabled.")
+            return
+
+        # One job per browser, each walking the pages in order.
+        results = {}
+        with st.spinner(f"Testing {len(pages_to_test)} pages on {len(browsers_to_test)} browsers in parallel..."):
+            with ThreadPoolExecutor(max_workers=len(browsers_to_test), initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as executor:
+                futures = {executor.submit(_test_pages, pages_to_test, browser, reuse_sessions, html_only): browser for browser in browsers_to_test}
+                for future in as_completed(futures):
+                    browser = futures[future]
+                    for page, result in future.result().items():
+                        results[page, browser] = result
+
+        st.session_state["analysis"] = analysis = [
+            (page, [(browser, results[page, browser]) for browser in browsers_to_test]) for page in pages_to_test
+        ]
+        all_results = []
+        for page, browser_results in analysis:
+            all_results.extend(_render_page(page, browser_results))
+
+        _render_summary(all_results)
+
+    elif "analysis" in st.session_state:
+        all_results = []
+        for page, browser_results in st.session_state["analysis"]:
+            all_results.extend(_render_page(page, browser_results))
+        _render_summary(all_results)
 
 # --- Streamlit App ---
 st.set_page_config(layout="wide")
+
+if "safari_ok" not in st.session_state:
+    st.session_state.safari_ok = _safari_available()
+
 st.title("Website Performance Analyzer")
 st.markdown("Analyze loading speed and resources for a page or multiple internal pages.")
 
@@ -111,85 +418,19 @@ test_scope = st.radio("Choose scope of analysis:", ["Test only this page", "Test
 
 # Dynamically build browser list
 browser_options = ["All Browsers", "Chrome", "Firefox", "Edge"]
-if platform.system() == "Darwin":
+if st.session_state.safari_ok:
     browser_options.append("Safari")
 browser_choice = st.selectbox("Choose a browser for analysis:", browser_options)
-
-if st.button("Analyze Website Performance"):
-    if url:
-        # Determine pages to test
-        if test_scope == "Test only this page":
-            pages_to_test = [url]
-        else:
-            pages_to_test = [url] + collect_internal_links(url, max_links=10)
-            st.markdown(f"Found {len(pages_to_test)} pages to test.")
-
-        if browser_choice == "All Browsers":
-            browsers_to_test = ["Chrome", "Firefox", "Edge"]
-            if platform.system() == "Darwin":
-                browsers_to_test.append("Safari")
-        else:
-            browsers_to_test = [browser_choice]
-
-        all_results = []
-
-        for page in pages_to_test:
-            st.markdown("---")
-            st.header(f"Page: {page}")
-            page_results = []
-
-            for browser in browsers_to_test:
-                with st.spinner(f"Testing {browser}... This may take a moment."):
-                    result = get_website_speed(page, browser)
-
-                if "Error" in result:
-                    st.error(f"Could not complete analysis on {browser}: {result['Error']}")
-                    continue
-
-                page_results.append({
-                    "Page": page,
-                    "Browser": browser,
-                    "Backend (ms)": result.get('Backend Performance (ms)', 0),
-                    "Frontend (ms)": result.get('Frontend Performance (ms)', 0),
-                    "Total (ms)": result.get('Total Page Load Time (ms)', 0)
-                })
-
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Backend Performance", f"{result.get('Backend Performance (ms)', 0)} ms")
-                col2.metric("Frontend Performance", f"{result.get('Frontend Performance (ms)', 0)} ms")
-                col3.metric("Total Load Time", f"{result.get('Total Page Load Time (ms)', 0)} ms")
-
-                if result.get("Resource Data"):
-                    df = pd.DataFrame(result["Resource Data"])
-                    if not df.empty:
-                        st.subheader("Resource Load Time by Type")
-                        type_summary = df.groupby("Type")["Duration (ms)"].sum().sort_values(ascending=False)
-                        st.bar_chart(type_summary)
-
-                        st.subheader("Top 20 Slowest Resources")
-                        slowest_resources = df.sort_values(by="Duration (ms)", ascending=False).head(20)
-                        st.dataframe(slowest_resources[["Name", "Type", "Duration (ms)"]], width="stretch")
-            
-            all_results.extend(page_results)
-
-        # --- Overall Summary ---
-        if all_results:
-            comp_df = pd.DataFrame(all_results)
-            comp_df['Assessment'] = comp_df['Total (ms)'].apply(lambda x: 'Excellent' if x<1000 else ('Acceptable' if x<=3000 else 'Slow'))
-
-            st.markdown("---")
-            st.header("Overall Summary")
-
-            st.subheader("Average Metrics per Browser")
-            avg_df = comp_df.groupby('Browser')[['Backend (ms)','Frontend (ms)','Total (ms)']].mean().round(2).reset_index()
-            st.dataframe(avg_df, width="stretch")
-
-            st.subheader("Full Per-Page Results")
-            st.dataframe(comp_df, width="stretch")
-
-            # CSV Download
-            csv = comp_df.to_csv(index=False).encode('utf-8')
-            st.download_button(label="Download all results as CSV", data=csv, file_name="website_performance.csv", mime="text/csv")
-
-    else:
-        st.warning("Please enter a valid URL to begin the analysis.")
+force_refresh = st.checkbox("Force refresh (ignore results cached in the last 5 minutes)")
+html_only = st.checkbox("Skip images (measure HTML/JS/CSS only)")
+if html_only:
+    st.caption("Images are not downloaded, so load times reflect non-media load only and will read lower than a real visit.")
+reuse_sessions = st.checkbox("Reuse browser sessions", value=False, help="Keep Chrome and Edge open between analyses of different sites. Their cache and cookies are cleared before every run, but DNS lookups and connections to shared hosts (e.g. CDNs) can stay warm, so repeat runs may read faster than a first visit. Off launches a clean browser every time.")
+if st.button("Close drivers", help="Quit all open browsers now; new ones start on the next run."):
+    _close_drivers()
+    st.success("All browsers closed.")
+
+if reuse_sessions:
+    _prewarm_drivers(browser_options[1:] if browser_choice == "All Browsers" else [browser_choice])
+
+analysis_section(url, test_scope, browser_choice, force_refresh, html_only, reuse_sessions)